@@ -12,8 +12,9 @@ Settings can be overridden using environment variables or a .env file.
 """
 
 import os
+from functools import lru_cache
 
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
@@ -52,15 +53,31 @@ class Settings(BaseSettings):
 
     # Database settings
     DATABASE_NAME: str = "currency_converter.db"
+    DATABASE_POOL_SIZE: int = 10
+    DATABASE_MAX_OVERFLOW: int = 20
+    DATABASE_POOL_RECYCLE: int = 1800  # Seconds before a pooled connection is recycled
+    DATABASE_TIMEOUT: int = 30  # Seconds to wait on a locked SQLite database
 
-    class Config:
-        """Configuration for Pydantic settings."""
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=True,
+        frozen=True,
+    )
 
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = True
-        use_enum_values = True
-        validate_assignment = True
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get the application settings, instantiated once per process.
 
-settings = Settings()
+    Returns:
+        Settings: The cached application settings.
+    """
+    return Settings()
+
+
+# Kept for backwards compatibility with modules importing `settings` directly
+settings = get_settings()
+
+# Supported currency codes, frozen for constant-time membership checks
+SUPPORTED_CURRENCIES: frozenset[str] = frozenset(settings.SUPPORTED_CURRENCIES)
@@ -2,34 +2,113 @@
 
 This module provides the core database functionality including:
 - Database engine configuration
-- Session management
+- Connection pooling and SQLite pragmas
+- Session management, with separate read-only sessions
 - Base model class
+- Schema initialization
 - Dependency for database operations
 """
 
+import sqlite3
 from collections.abc import Generator
+from functools import lru_cache
+from typing import Any
 
-from sqlalchemy import Engine, create_engine
+from sqlalchemy import Connection, Engine, create_engine, event, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from app.core.config import settings
 
+# Pragmas applied to every new SQLite connection
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+)
+
+# Changing the journal mode writes to the database file, so read-only connections skip it
+SQLITE_READ_ONLY_PRAGMAS = tuple(pragma for pragma in SQLITE_PRAGMAS if "journal_mode" not in pragma)
+
+
+class ReadOnlySQLiteConnection(sqlite3.Connection):
+    """Marker connection class for SQLite connections opened with `mode=ro`."""
+
+
+@event.listens_for(Engine, "connect")
+def set_sqlite_pragmas(dbapi_connection: Any, _connection_record: Any) -> None:  # noqa: ANN401
+    """Apply the SQLite pragmas to a freshly opened DBAPI connection.
+
+    Registered once for every engine, so it is a no-op for non-SQLite drivers.
+
+    Args:
+        dbapi_connection: The raw DBAPI connection.
+        _connection_record: The pool's connection record (unused).
+    """
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+
+    read_only = isinstance(dbapi_connection, ReadOnlySQLiteConnection)
+    pragmas = SQLITE_READ_ONLY_PRAGMAS if read_only else SQLITE_PRAGMAS
+
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in pragmas:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def _create_sqlite_engine(database_url: str, *, read_only: bool = False) -> Engine:
+    """Create a pooled SQLite engine.
+
+    Args:
+        database_url: The SQLAlchemy database URL.
+        read_only: Whether the URL opens the database with `mode=ro`.
+
+    Returns:
+        Engine: The configured SQLAlchemy engine.
+    """
+    connect_args: dict[str, Any] = {"check_same_thread": False, "timeout": settings.DATABASE_TIMEOUT}
+    if read_only:
+        connect_args["factory"] = ReadOnlySQLiteConnection
+
+    return create_engine(
+        database_url,
+        connect_args=connect_args,
+        poolclass=QueuePool,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_pre_ping=True,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+    )
+
 
 class DatabaseManager:
     """Manages database connections and sessions."""
 
     def __init__(self) -> None:
-        """Initialize the database manager with the configured database URI."""
-        database_url = f"sqlite:///./{settings.DATABASE_NAME}"
-        self.engine = create_engine(database_url, connect_args={"check_same_thread": False})
+        """Initialize the database manager with the configured database URI.
+
+        Besides the read-write engine, a read-only engine is opened on the same
+        file so that readers do not compete with writers for connections.
+        """
+        self.engine = _create_sqlite_engine(f"sqlite:///./{settings.DATABASE_NAME}")
+        self.read_engine = _create_sqlite_engine(
+            f"sqlite:///file:{settings.DATABASE_NAME}?mode=ro&uri=true", read_only=True
+        )
+        self.default_engine = self.engine
+        self.default_read_engine = self.read_engine
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.read_engine)
 
-    def get_db(self) -> Generator:
+    def get_db(self) -> Generator[Session]:
         """Create a new database session.
 
         Yields:
-            Generator: A database session that should be closed after use.
+            Session: A database session, closed once the caller is done with it.
         """
         db = self.SessionLocal()
         try:
@@ -37,20 +116,51 @@ class DatabaseManager:
         finally:
             db.close()
 
-    def set_engine(self, new_engine: Engine) -> None:
+    def get_read_db(self) -> Generator[Session]:
+        """Create a new read-only database session.
+
+        Yields:
+            Session: A read-only database session, closed once the caller is done with it.
+        """
+        db = self.ReadSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def set_engine(self, new_engine: Engine, read_engine: Engine | None = None) -> None:
         """Set a new database engine.
 
+        Setting the engines that are already in use is a no-op.
+
         Args:
             new_engine: The new SQLAlchemy engine to set.
+            read_engine: The engine for read-only sessions. Defaults to `new_engine`.
         """
+        read_engine = read_engine or new_engine
+        if new_engine is self.engine and read_engine is self.read_engine:
+            return
         self.engine = new_engine
+        self.read_engine = read_engine
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.read_engine)
 
-    def get_engine(self) -> Generator:
+    def reset_engine(self) -> None:
+        """Dispose of engines set with set_engine and restore the default ones."""
+        if self.engine is self.default_engine and self.read_engine is self.default_read_engine:
+            return
+        for engine in {self.engine, self.read_engine} - {self.default_engine, self.default_read_engine}:
+            engine.dispose()
+        self.engine = self.default_engine
+        self.read_engine = self.default_read_engine
+        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.read_engine)
+
+    def get_engine(self) -> Engine:
         """Get the current database engine.
 
         Returns:
-            Generator: The current SQLAlchemy engine.
+            Engine: The current SQLAlchemy engine.
         """
         return self.engine
 
@@ -62,29 +172,97 @@ database_manager = DatabaseManager()
 Base = declarative_base()
 
 
+@lru_cache(maxsize=1)
+def get_session_factory() -> sessionmaker:
+    """Get the session factory bound to the current database engine.
+
+    Returns:
+        sessionmaker: The cached session factory.
+    """
+    return database_manager.SessionLocal
+
+
 # Expose get_db as a module-level function
-def get_db() -> Generator:
-    """Get a database session from the database manager.
+def get_db() -> Generator[Session]:
+    """Get a database session from the cached session factory.
+
+    Yields:
+        Session: A database session, closed once the request is done with it.
+    """
+    db = get_session_factory()()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db() -> Generator[Session]:
+    """Get a read-only database session from the database manager.
 
     Yields:
-        Generator: A database session that should be closed after use.
+        Session: A read-only database session, closed once the request is done with it.
+    """
+    yield from database_manager.get_read_db()
+
+
+def _drop_duplicate_exchange_rates(connection: Connection) -> None:
+    """Keep only the newest backup row per base currency.
+
+    Databases created before the unique `uq_rates_base` index gained a new row
+    on every refresh, which would make creating the index fail.
+
+    Args:
+        connection: The connection to run the cleanup on.
     """
-    yield database_manager.get_db()
+    index_names = {index["name"] for index in inspect(connection).get_indexes("exchange_rates")}
+    if "uq_rates_base" in index_names:
+        return
+    connection.execute(
+        text(
+            "DELETE FROM exchange_rates WHERE id NOT IN "
+            "(SELECT MAX(id) FROM exchange_rates GROUP BY base_currency)"
+        )
+    )
 
 
-def get_engine() -> Generator:
+def init_db() -> None:
+    """Create missing tables and indexes on the current database engine.
+
+    Indexes are created individually so that databases created before an
+    index was added to the models also receive it.
+    """
+    import app.models  # noqa: F401, PLC0415 - registers the models on Base.metadata
+
+    engine = database_manager.get_engine()
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        _drop_duplicate_exchange_rates(connection)
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=connection, checkfirst=True)
+
+
+def get_engine() -> Engine:
     """Get the current database engine from the database manager.
 
     Returns:
-        Generator: The current SQLAlchemy engine.
+        Engine: The current SQLAlchemy engine.
     """
-    yield database_manager.get_engine()
+    return database_manager.get_engine()
 
 
-def set_engine(new_engine: Engine) -> None:
+def set_engine(new_engine: Engine, read_engine: Engine | None = None) -> None:
     """Set a new database engine in the database manager.
 
     Args:
         new_engine: The new SQLAlchemy engine to set.
+        read_engine: The engine for read-only sessions. Defaults to `new_engine`.
     """
-    database_manager.set_engine(new_engine)
+    database_manager.set_engine(new_engine, read_engine)
+    get_session_factory.cache_clear()
+
+
+def reset_engine() -> None:
+    """Dispose of engines set with set_engine and restore the default ones."""
+    database_manager.reset_engine()
+    get_session_factory.cache_clear()
@@ -5,32 +5,58 @@ This module initializes the FastAPI application and includes the root and health
 It also sets up the application with the project name, description, version, and API documentation URLs.
 """
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
-from app.core.config import settings
+from app.core.config import get_settings
+from app.core.database import init_db
+from app.services.rate_service import close_http_client
+
 
-app = FastAPI(
-    title=settings.PROJECT_NAME,
-    description=settings.PROJECT_DESCRIPTION,
-    version=settings.PROJECT_VERSION,
-    docs_url=settings.PROJECT_DOCS_URL,
-    redoc_url=settings.PROJECT_REDOC_URL,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json",
-)
+@asynccontextmanager
+async def lifespan(_application: FastAPI) -> AsyncIterator[None]:
+    """Initialize the database on startup and release shared resources on shutdown."""
+    init_db()
+    yield
+    await close_http_client()
 
 
-@app.get("/")
 async def root() -> dict[str, str]:
     """Root endpoint."""
     return {"message": "Welcome to the Currency Converter API!"}
 
 
-@app.get("/health")
 async def health_check() -> dict[str, str]:
     """Health check endpoint."""
     return {"status": "healthy"}
 
 
+def create_app() -> FastAPI:
+    """Create and configure the FastAPI application.
+
+    Returns:
+        FastAPI: The configured application instance.
+    """
+    settings = get_settings()
+    application = FastAPI(
+        title=settings.PROJECT_NAME,
+        description=settings.PROJECT_DESCRIPTION,
+        version=settings.PROJECT_VERSION,
+        docs_url=settings.PROJECT_DOCS_URL,
+        redoc_url=settings.PROJECT_REDOC_URL,
+        openapi_url=f"{settings.API_V1_STR}/openapi.json",
+        lifespan=lifespan,
+    )
+    application.add_api_route("/", root, methods=["GET"])
+    application.add_api_route("/health", health_check, methods=["GET"])
+    return application
+
+
+app = create_app()
+
+
 if __name__ == "__main__":
     import uvicorn
 
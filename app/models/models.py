@@ -4,12 +4,14 @@ This module defines the database models used in the application.
 - Transaction: Stores currency conversion transactions.
 - ExchangeRate: Stores exchange rates as backup data.
 """
-from datetime import UTC, datetime
-
-from sqlalchemy import JSON, Column, DateTime, Integer, Numeric, String
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, Numeric, String, text
 
 from app.core.database import Base
 
+# Current UTC time in the format SQLAlchemy's SQLite DateTime stores and binds, so
+# database-filled timestamps keep microseconds and compare correctly with filters
+SQLITE_UTC_NOW = text("(strftime('%Y-%m-%d %H:%M:%f000', 'now'))")
+
 
 class Transaction(Base):
     """SQLAlchemy model for currency conversion transaction."""
@@ -17,17 +19,23 @@ class Transaction(Base):
     __tablename__ = "transactions"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(String, index=True)
+    user_id = Column(String)
     source_currency = Column(String(3))
     target_currency = Column(String(3))
     source_amount = Column(Numeric(18, 2))
     target_amount = Column(Numeric(18, 2))
     exchange_rate = Column(Numeric(18, 2))
+    # Set by the database clock; `default` covers tables created before the server default
     timestamp = Column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(UTC)
+        default=SQLITE_UTC_NOW,
+        server_default=SQLITE_UTC_NOW,
+        nullable=False,
     )
 
+    # Serves the history query: filter by user, range and order by timestamp
+    __table_args__ = (Index("ix_transactions_user_ts", "user_id", timestamp.desc()),)
+
 
 class ExchangeRate(Base):
     """SQLAlchemy model for exchange rates as backup."""
@@ -39,5 +47,11 @@ class ExchangeRate(Base):
     rates = Column(JSON)
     last_updated = Column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(UTC)
+        default=SQLITE_UTC_NOW,
+        server_default=SQLITE_UTC_NOW,
+        nullable=False,
     )
+
+    # One backup row per base currency, updated in place on refresh. Declared as an
+    # index rather than a table constraint so init_db can add it to existing tables.
+    __table_args__ = (Index("uq_rates_base", "base_currency", unique=True),)
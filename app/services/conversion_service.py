@@ -1,5 +1,5 @@
 import logging
-from datetime import datetime, timezone
+from datetime import timezone
 from decimal import Decimal
 
 from sqlalchemy.orm import Session
@@ -10,6 +10,9 @@ from app.services.rate_service import RateService
 
 logger = logging.getLogger(__name__)
 
+# Monetary precision for stored rates and amounts
+_CENTS = Decimal("0.01")
+
 
 class ConversionService:
     """Service to handle currency conversion operations."""
@@ -57,8 +60,8 @@ class ConversionService:
             exchange_rate = Decimal(str(exchange_rate))
 
         # Format exchange rate and converted amount to 2 decimal places
-        exchange_rate = exchange_rate.quantize(Decimal("0.01"))
-        converted_amount = (amount * exchange_rate).quantize(Decimal("0.01"))
+        exchange_rate = exchange_rate.quantize(_CENTS)
+        converted_amount = (amount * exchange_rate).quantize(_CENTS)
 
         # Save transaction
         transaction = Transaction(
@@ -68,18 +71,24 @@ class ConversionService:
             source_amount=amount,
             target_amount=converted_amount,
             exchange_rate=exchange_rate,
-            timestamp=datetime.now(timezone.utc),
         )
         db.add(transaction)
+        # Flush to get the generated id and server-side timestamp, read before commit expires the instance
+        db.flush()
+        transaction_id = transaction.id
+        timestamp = transaction.timestamp
         db.commit()
-        db.refresh(transaction)
+
+        # SQLite returns naive UTC timestamps
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
 
         # Return conversion result
         return {
-            "transaction_id": transaction.id,
+            "transaction_id": transaction_id,
             "user_id": user_id,
             "from": {"currency": from_currency, "amount": amount},
             "to": {"currency": to_currency, "amount": converted_amount},
             "rate": exchange_rate,
-            "timestamp": transaction.timestamp,
+            "timestamp": timestamp,
         }
@@ -10,26 +10,58 @@ The service uses an external API for real-time rates and implements
 a multi-layer fallback strategy (cache -> database -> error) for reliability.
 """
 import logging
-from datetime import UTC, datetime, timedelta
+import time
 from decimal import Decimal, getcontext
 from http import HTTPStatus
 
 import httpx
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
-from app.core.config import settings
+from app.core.config import SUPPORTED_CURRENCIES, settings
 from app.core.exceptions import ExternalAPIError, InvalidCurrencyError
 from app.models import ExchangeRate
+from app.models.models import SQLITE_UTC_NOW
 
 # Set decimal precision for monetary calculations
 getcontext().prec = 15
 
 logger = logging.getLogger(__name__)
 
+# Precision for exchange rates, parsed once rather than on every calculation
+_NINE_PLACES = Decimal("1E-9")
+_ONE = Decimal(1)
+
+# Shared HTTP client so connections to the exchange rate API are kept alive
+_HTTP_CLIENT: httpx.AsyncClient | None = None
+_HTTP_TIMEOUT = httpx.Timeout(5.0, connect=2.0)
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+
+
+async def get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it on first use.
+
+    Returns:
+        httpx.AsyncClient: The process-wide client for the exchange rate API.
+    """
+    global _HTTP_CLIENT  # noqa: PLW0603
+    if _HTTP_CLIENT is None or _HTTP_CLIENT.is_closed:
+        _HTTP_CLIENT = httpx.AsyncClient(timeout=_HTTP_TIMEOUT, limits=_HTTP_LIMITS)
+    return _HTTP_CLIENT
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and release its pooled connections."""
+    global _HTTP_CLIENT  # noqa: PLW0603
+    if _HTTP_CLIENT is not None:
+        await _HTTP_CLIENT.aclose()
+        _HTTP_CLIENT = None
+
 
 class RateService:
     """Service to handle exchange rate operations."""
-    def __init__(self) -> None:
+    def __init__(self, cache: dict[str, Decimal] | None = None, http_client: httpx.AsyncClient | None = None) -> None:
         """Initialize the RateService.
 
         Uses configuration from settings:
@@ -37,20 +69,47 @@ class RateService:
         - EXCHANGE_RATE_API_KEY: API key for authentication
         - EXCHANGE_RATE_API_BASE_CURRENCY: Base currency for rate calculations
         - EXCHANGE_RATE_CACHE_TTL: Time-to-live for cached rates in seconds
+
+        Args:
+            cache: Dictionary the service keeps its cached rates in, updated in place.
+                Rates already in it are treated as expired, so they are only used as a
+                fallback until the first successful refresh. Defaults to a new dictionary.
+            http_client: Client for the exchange rate API. Defaults to the shared client.
         """
         self.base_url = settings.EXCHANGE_RATE_API_URL
         self.api_key = settings.EXCHANGE_RATE_API_KEY
         self.base_currency = settings.EXCHANGE_RATE_API_BASE_CURRENCY
         self.ttl = settings.ECHANGE_RATE_CACHE_TTL
-        self.cache = {}
+        self._rates: dict[str, Decimal] = {} if cache is None else cache
+        self._expires_at: float = 0.0
+        self._pair_rates: dict[tuple[str, str], Decimal] = {}
+        self._http_client = http_client
+
+    def clear_cache(self) -> None:
+        """Drop the cached exchange rates so the next lookup refreshes them."""
+        self._rates.clear()
+        self._expires_at = 0.0
+        self._pair_rates = {}
+
+    def is_valid_currency(self, currency: str) -> bool:
+        """Check whether a currency code is supported.
+
+        Args:
+            currency: Currency code to check.
 
-    async def get_exchange_rate(self, from_currency: str, to_currency: str, db: Session) -> Decimal:
+        Returns:
+            bool: True if the currency is supported, False otherwise.
+        """
+        return currency in SUPPORTED_CURRENCIES
+
+    async def get_exchange_rate(self, from_currency: str, to_currency: str, db: Session, read_db: Session | None = None) -> Decimal:
         """Get exchange rate between two currencies.
 
         Args:
             from_currency: Source currency code.
             to_currency: Target currency code.
             db: Database session for fallback storage.
+            read_db: Optional read-only session for reading fallback rates. Defaults to `db`.
 
         Returns:
             Decimal: Exchange rate from `from_currency` to `to_currency`.
@@ -60,44 +119,92 @@ class RateService:
             ExternalAPIError: If external API call fails.
         """
         # Validate currencies
-        for currency in [from_currency, to_currency]:
-            if currency not in settings.SUPPORTED_CURRENCIES:
+        for currency in (from_currency, to_currency):
+            if not self.is_valid_currency(currency):
                 raise InvalidCurrencyError(currency)
 
         # Same currency conversion
         if from_currency == to_currency:
-            return Decimal("1")
+            return _ONE
+
+        # Get rates with EUR as base, only awaiting when the cache is stale
+        rates = self._get_cached_rates()
+        if rates is None:
+            rates = await self._refresh_rates(db, read_db)
+
+        # Use the precomputed pair table when the rates are the cached ones
+        if rates is self._rates:
+            rate = self._pair_rates.get((from_currency, to_currency))
+            if rate is not None:
+                return rate
+
+        return self._calculate_rate(rates, from_currency, to_currency)
 
-        # Get rates with EUR as base
-        rates = await self._get_rates(db)
 
-        # Calculate exchange rate
+    def _calculate_rate(self, rates: dict[str, Decimal], from_currency: str, to_currency: str) -> Decimal:
+        """Calculate the exchange rate between two currencies from base currency rates.
+
+        Args:
+            rates: Dictionary with currency codes as keys and rates as values.
+            from_currency: Source currency code.
+            to_currency: Target currency code.
+
+        Returns:
+            Decimal: Exchange rate from `from_currency` to `to_currency`.
+        """
         if from_currency == self.base_currency:
             rate = rates[to_currency]
         elif to_currency == self.base_currency:
-            rate = Decimal("1") / rates[from_currency]
+            rate = _ONE / rates[from_currency]
         else:
             rate = rates[to_currency] / rates[from_currency]
 
         # Set a reasonable precision
-        return rate.quantize(Decimal("0.000000001"))
+        return rate.quantize(_NINE_PLACES)
 
 
-    async def _get_rates(self, db: Session) -> dict[str, Decimal]:
-        """Get all exchange rates with caching.
+    def _build_pair_rates(self, rates: dict[str, Decimal]) -> dict[tuple[str, str], Decimal]:
+        """Precompute the exchange rate for every pair of supported currencies.
+
+        Args:
+            rates: Dictionary with currency codes as keys and rates as values.
+
+        Returns:
+            dict: Exchange rates keyed by (from_currency, to_currency).
+        """
+        currencies = [currency for currency in SUPPORTED_CURRENCIES if currency in rates or currency == self.base_currency]
+        return {
+            (from_currency, to_currency): self._calculate_rate(rates, from_currency, to_currency)
+            for from_currency in currencies
+            for to_currency in currencies
+            if from_currency != to_currency
+        }
+
+
+    def _get_cached_rates(self) -> dict[str, Decimal] | None:
+        """Get the cached exchange rates if they have not expired.
+
+        Returns:
+            Optional[dict]: Cached rates, or None if the cache is empty or expired.
+        """
+        if self._rates and time.monotonic() < self._expires_at:
+            return self._rates
+        return None
+
+
+    async def _refresh_rates(self, db: Session, read_db: Session | None = None) -> dict[str, Decimal]:
+        """Refresh exchange rates from the external API with fallbacks.
+
+        Args:
+            db: Database session for fallback storage.
+            read_db: Optional read-only session for reading fallback rates. Defaults to `db`.
 
         Returns:
             dict: Dictionary with currency codes as keys and rates as values.
 
         Raises:
-            ExternalAPIError: If external API call fails.
+            ExternalAPIError: If external API call fails and no fallback is available.
         """
-        # Check if rates are in cache and not expired
-        if self.base_currency in self.cache:
-            cached_data = self.cache[self.base_currency]
-            if datetime.now(UTC) < cached_data["expires_at"]:
-                return cached_data["rates"]
-
         try:
             # Fetch from external API
             logger.info("Fetching exchange rates from external API")
@@ -106,12 +213,12 @@ class RateService:
             logger.exception("Error fetching exchange rates")
 
             # Try to use cached rates even if expired
-            if self.base_currency in self.cache:
+            if self._rates:
                 logger.warning("Using expired cached exchange rates")
-                return self.cache[self.base_currency]["rates"]
+                return self._rates
 
             # Try to use rates from the database
-            db_rates = self._get_rates_from_db(db)
+            db_rates = self._get_rates_from_db(read_db or db)
             if db_rates:
                 logger.warning("Using exchange rates from database")
                 return db_rates
@@ -121,15 +228,15 @@ class RateService:
             raise ExternalAPIError(error_msg) from e
         else:
             # Cache the rates
-            self.cache[self.base_currency] = {
-                "rates": rates,
-                "expires_at": datetime.now(UTC) + timedelta(seconds=self.ttl),
-            }
+            self._rates.clear()
+            self._rates.update(rates)
+            self._expires_at = time.monotonic() + self.ttl
+            self._pair_rates = self._build_pair_rates(rates)
 
             # Save to database as fallback
             self._save_rates_to_db(db, rates)
 
-            return rates
+            return self._rates
 
 
     async def _fetch_from_external_api(self) -> dict[str, Decimal]:
@@ -140,26 +247,28 @@ class RateService:
         """
         params = {"base": self.base_currency, "access_key": self.api_key}
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(self.base_url, params=params)
-            if response.status_code != HTTPStatus.OK:
-                error_msg = f"API return status code {response.status_code}"
-                raise ExternalAPIError(error_msg)
+        client = self._http_client or await get_http_client()
+        response = await client.get(self.base_url, params=params)
+        if response.status_code != HTTPStatus.OK:
+            error_msg = f"API return status code {response.status_code}"
+            raise ExternalAPIError(error_msg)
 
-            data = response.json()
-            if "rates" not in data:
-                error_msg = "Invalid response from exchange rate API"
-                raise ExternalAPIError(error_msg)
+        data = response.json()
+        if "rates" not in data:
+            error_msg = "Invalid response from exchange rate API"
+            raise ExternalAPIError(error_msg)
 
-            # Convert float rates to Decimal
-            return {
-                currency: Decimal(str(rate)) for currency, rate in data["rates"].items()
-            }
+        # Convert float rates to Decimal
+        return {
+            currency: Decimal(str(rate)) for currency, rate in data["rates"].items()
+        }
 
 
     def _save_rates_to_db(self, db: Session, rates: dict[str, Decimal]) -> None:
         """Save exchange rates to database as backup.
 
+        Keeps a single row per base currency, updating it in place on refresh.
+
         Args:
             db: Database session
             rates: Dictionary with currency codes as keys and rates as values
@@ -168,13 +277,17 @@ class RateService:
             # Convert Decimal to string to ensure proper serialization
             str_rates = {currency: str(rate) for currency, rate in rates.items()}
 
-            exchange_rate = ExchangeRate(
+            stmt = insert(ExchangeRate).values(
                 base_currency=self.base_currency,
                 rates=str_rates,
-                last_updated=datetime.now(UTC),
+                last_updated=SQLITE_UTC_NOW,
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[ExchangeRate.base_currency],
+                set_={"rates": stmt.excluded.rates, "last_updated": stmt.excluded.last_updated},
             )
 
-            db.add(exchange_rate)
+            db.execute(stmt)
             db.commit()
         except Exception:
             logger.exception("Error saving exchange rates to database")
@@ -185,26 +298,26 @@ class RateService:
         """Get exchange rates from database.
 
         Args:
-            db: Database session
+            db: Database session, a read-only session is sufficient
 
         Returns:
             Optional[Dict[str, Decimal]]: Dictionary with currency codes as keys and rates as values
         """
         try:
-            # Get the most recent rates
-            exchange_rate = (
-                db.query(ExchangeRate)
+            # Get the most recent rates, fetching only the rates column
+            rates = (
+                db.query(ExchangeRate.rates)
                 .filter(ExchangeRate.base_currency == self.base_currency)
                 .order_by(ExchangeRate.last_updated.desc())
-                .first()
+                .limit(1)
+                .scalar()
             )
+        except SQLAlchemyError:
+            logger.exception("Error retrienving exchange rates from database")
+            return None
 
-            if exchange_rate:
-                # Convert string rates back to Decimal
-                return {
-                    currency: Decimal(rate)
-                    for currency, rate in exchange_rate.rates.items()
-                }
+        if not rates:
+            return None
 
-        except Exception:
-            logger.exception("Error retrienving exchange rates from database")
+        # Convert string rates back to Decimal
+        return {currency: Decimal(rate) for currency, rate in rates.items()}
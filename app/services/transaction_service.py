@@ -1,7 +1,7 @@
 import logging
 from datetime import datetime, timezone
 
-from sqlalchemy import desc
+from sqlalchemy import Row, desc, func
 from sqlalchemy.orm import Session
 
 from app.core.exceptions import UserNotFoundError
@@ -24,7 +24,7 @@ class TransactionService:
 
         Args:
             user_id: User identifier
-            db: Database session
+            db: Database session, a read-only session from get_read_db is sufficient
             limit: Maximum number of transactions to return
             offset: Offset for pagination
             from_date: Filter transactions from this date
@@ -34,11 +34,9 @@ class TransactionService:
         Raises:
             UserNotFoundError: If no transactions found for user
         """
-        # Start with base user query
-        query = db.query(Transaction).filter(Transaction.user_id == user_id)
-
         # First check if user has any transactions
-        if query.count() == 0:
+        user_filter = Transaction.user_id == user_id
+        if not db.query(db.query(Transaction).filter(user_filter).exists()).scalar():
             raise UserNotFoundError(user_id)
 
         logger.info("\nConstructing query with filters:")
@@ -47,38 +45,53 @@ class TransactionService:
         logger.info(f"To date: {to_date}")
 
         # Apply date filters
+        filters = [user_filter]
         if from_date:
             # Ensure UTC timezone
             from_date = from_date.astimezone(timezone.utc)
             msg = f"Filtering transactions >= {from_date}"
             logger.info(msg)
-            query = query.filter(Transaction.timestamp >= from_date)
+            filters.append(Transaction.timestamp >= from_date)
 
         if to_date:
             # Ensure UTC timezone
             to_date = to_date.astimezone(timezone.utc)
             msg = f"Filtering transaction >= {to_date}"
             logger.info(msg)
-            query = query.filter(Transaction.timestamp <= to_date)
-
-        # Get filtered count
-        filtered_count = query.count()
-        msg = f"Found {filtered_count} transactions after date filtering"
-        logger.info(msg)
-
-
-        # Apply ordering (newest first)
-        query = query.order_by(desc(Transaction.timestamp))
+            filters.append(Transaction.timestamp <= to_date)
+
+        # Select plain columns to skip ORM hydration, applying ordering (newest first)
+        query = (
+            db.query(
+                Transaction.id,
+                Transaction.source_currency,
+                Transaction.target_currency,
+                Transaction.source_amount,
+                Transaction.target_amount,
+                Transaction.exchange_rate,
+                Transaction.timestamp,
+            )
+            .filter(*filters)
+            .order_by(desc(Transaction.timestamp), desc(Transaction.id))
+        )
 
         # Apply pagination if specified
+        paginated = False
         if offset is not None and offset >= 0:
             query = query.offset(offset)
+            paginated = offset > 0
         if limit is not None and limit > 0:
             query = query.limit(limit)
+            paginated = True
 
         # Execute query
         transactions = query.all()
 
+        # Get filtered count, only querying it when pagination hides rows
+        filtered_count = db.query(func.count(Transaction.id)).filter(*filters).scalar() if paginated else len(transactions)
+        msg = f"Found {filtered_count} transactions after date filtering"
+        logger.info(msg)
+
         # formatted_transactions
         formatted_transactions = [self._format_transaction(tx) for tx in transactions]
 
@@ -93,28 +106,29 @@ class TransactionService:
         return result
 
 
-    def _format_transactions(self, transaction: Transaction) -> dict:
+    def _format_transaction(self, row: Row) -> dict:
         """
-        Format transaction model to response dictionary.
+        Format transaction row to response dictionary.
 
         Args:
-            transaction: Transaction model
+            row: Transaction columns as selected by get_user_transactions
         """
+        transaction_id, source_currency, target_currency, source_amount, target_amount, exchange_rate, timestamp = row
+
         # Ensure timezone info and proper ISO format
-        timestamp = transaction.timestamp
         if timestamp.tzinfo is None:
             timestamp = timestamp.replace(tzinfo=timezone.utc)
 
         return {
-            "transaction_id": transaction.id,
+            "transaction_id": transaction_id,
             "from": {
-                "currency": transaction.source_currency,
-                "amount": transaction.source_amount,
+                "currency": source_currency,
+                "amount": source_amount,
             },
             "to": {
-                "currency": transaction.target_currency,
-                "amount": transaction.target_amount,
+                "currency": target_currency,
+                "amount": target_amount,
             },
-            "rate": transaction.exchange_rate,
+            "rate": exchange_rate,
             "timestamp": timestamp,
         }
@@ -0,0 +1,5 @@
+"""Core package test package.
+
+This package contains unit tests for the application's core components,
+including configuration and database management.
+"""
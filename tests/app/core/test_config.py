@@ -0,0 +1,26 @@
+"""Tests for the configuration module.
+
+This module contains unit tests for settings loading and caching.
+"""
+import pytest
+from pydantic import ValidationError
+
+from app.core.config import SUPPORTED_CURRENCIES, get_settings, settings
+
+
+def test_get_settings_is_cached() -> None:
+    """Test settings are instantiated once and shared."""
+    assert get_settings() is get_settings()
+    assert get_settings() is settings
+
+
+def test_settings_are_frozen() -> None:
+    """Test settings cannot be reassigned at runtime."""
+    with pytest.raises(ValidationError):
+        settings.PROJECT_NAME = "Changed"
+
+
+def test_supported_currencies_frozenset() -> None:
+    """Test supported currencies are exposed as a frozenset."""
+    assert isinstance(SUPPORTED_CURRENCIES, frozenset)
+    assert set(settings.SUPPORTED_CURRENCIES) == SUPPORTED_CURRENCIES
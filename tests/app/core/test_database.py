@@ -0,0 +1,169 @@
+"""Tests for the database module.
+
+This module contains unit tests for database engine configuration,
+connection pragmas and session management.
+"""
+import sqlite3
+from decimal import Decimal
+from pathlib import Path
+
+from sqlalchemy import Engine, create_engine, inspect, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import QueuePool
+
+from app.core.database import (
+    DatabaseManager,
+    _create_sqlite_engine,
+    get_db,
+    get_engine,
+    get_read_db,
+    get_session_factory,
+    init_db,
+    set_engine,
+)
+from app.services.rate_service import RateService
+
+
+def test_default_engine_uses_queue_pool() -> None:
+    """Test the default engine is backed by a QueuePool."""
+    manager = DatabaseManager()
+    try:
+        assert isinstance(manager.engine.pool, QueuePool)
+    finally:
+        manager.engine.dispose()
+
+
+def test_sqlite_connections_get_pragmas(tmp_path: Path) -> None:
+    """Test every new SQLite connection gets WAL and relaxed synchronous mode."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'pragmas.db'}")
+    try:
+        with engine.connect() as connection:
+            assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert connection.execute(text("PRAGMA synchronous")).scalar() == 1
+            assert connection.execute(text("PRAGMA temp_store")).scalar() == 2
+    finally:
+        engine.dispose()
+
+
+def test_get_db_yields_session(engine: Engine) -> None:
+    """Test get_db yields a bound session and closes it afterwards."""
+    generator = get_db()
+    session = next(generator)
+    assert isinstance(session, Session)
+    assert session.get_bind() is engine
+
+    generator.close()
+    assert not session.in_transaction()
+
+
+def test_get_engine_and_session_factory_follow_set_engine(engine: Engine) -> None:
+    """Test helpers return the engine and factory installed by set_engine."""
+    assert get_engine() is engine
+    assert get_session_factory().kw["bind"] is engine
+
+
+def test_init_db_creates_missing_indexes(engine: Engine) -> None:
+    """Test init_db adds indexes to tables that already exist."""
+    with engine.begin() as connection:
+        connection.execute(text("DROP INDEX ix_transactions_user_ts"))
+
+    init_db()
+
+    index_names = {index["name"] for index in inspect(engine).get_indexes("transactions")}
+    assert "ix_transactions_user_ts" in index_names
+
+
+def test_set_engine_same_engine_keeps_session_factory(engine: Engine) -> None:
+    """Test setting the current engine again does not rebuild the session factory."""
+    session_factory = get_session_factory()
+    set_engine(engine)
+    assert get_session_factory() is session_factory
+
+
+def test_reset_engine_restores_default(tmp_path: Path) -> None:
+    """Test reset_engine disposes the swapped engine and restores the default one."""
+    manager = DatabaseManager()
+    default_engine = manager.get_engine()
+    manager.set_engine(create_engine(f"sqlite:///{tmp_path / 'swap.db'}"))
+    assert manager.get_engine() is not default_engine
+
+    manager.reset_engine()
+    assert manager.get_engine() is default_engine
+    assert manager.SessionLocal.kw["bind"] is default_engine
+    default_engine.dispose()
+    manager.read_engine.dispose()
+
+
+def test_default_read_engine_is_read_only() -> None:
+    """Test the default read engine opens the database in read-only mode."""
+    manager = DatabaseManager()
+    try:
+        assert manager.read_engine is not manager.engine
+        assert manager.read_engine.url.query["mode"] == "ro"
+    finally:
+        manager.engine.dispose()
+        manager.read_engine.dispose()
+
+
+def test_read_engine_opens_database_not_in_wal_mode(tmp_path: Path) -> None:
+    """Test read-only connections work without switching the journal mode."""
+    database_path = tmp_path / "rollback.db"
+    connection = sqlite3.connect(database_path)
+    connection.execute("CREATE TABLE rates (currency TEXT)")
+    connection.commit()
+    connection.close()
+
+    read_engine = _create_sqlite_engine(f"sqlite:///file:{database_path}?mode=ro&uri=true", read_only=True)
+    try:
+        with read_engine.connect() as read_connection:
+            assert read_connection.execute(text("SELECT COUNT(*) FROM rates")).scalar() == 0
+            assert read_connection.execute(text("PRAGMA journal_mode")).scalar() == "delete"
+            assert read_connection.execute(text("PRAGMA temp_store")).scalar() == 2
+    finally:
+        read_engine.dispose()
+
+
+def test_get_read_db_follows_set_engine(engine: Engine) -> None:
+    """Test read sessions use the engine installed by set_engine."""
+    generator = get_read_db()
+    session = next(generator)
+    assert session.get_bind() is engine
+    generator.close()
+
+
+def test_init_db_upgrades_exchange_rates_without_unique_index(engine: Engine, tmp_path: Path) -> None:
+    """Test init_db drops duplicate backup rows and adds the unique index."""
+    old_engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with old_engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE exchange_rates (id INTEGER PRIMARY KEY, base_currency VARCHAR(3), "
+                "rates JSON, last_updated DATETIME)"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO exchange_rates (base_currency, rates) VALUES "
+                "('USD', '{\"EUR\": \"0.90\"}'), ('USD', '{\"EUR\": \"0.92\"}'), ('EUR', '{\"USD\": \"1.10\"}')"
+            )
+        )
+
+    set_engine(old_engine)
+    try:
+        init_db()
+
+        with old_engine.connect() as connection:
+            rows = connection.execute(text("SELECT base_currency, rates FROM exchange_rates ORDER BY id")).all()
+        assert rows == [("USD", '{"EUR": "0.92"}'), ("EUR", '{"USD": "1.10"}')]
+        unique_indexes = {
+            index["name"] for index in inspect(old_engine).get_indexes("exchange_rates") if index["unique"]
+        }
+        assert "uq_rates_base" in unique_indexes
+
+        # The refresh upsert relies on the index as its conflict target
+        with Session(old_engine) as session:
+            RateService()._save_rates_to_db(session, {"EUR": Decimal("0.95")})  # noqa: SLF001
+            assert session.execute(text("SELECT COUNT(*) FROM exchange_rates")).scalar() == 2
+    finally:
+        set_engine(engine)
+        old_engine.dispose()
@@ -1,12 +1,15 @@
-from collections.abc import Generator
+from collections.abc import Generator, Mapping
 from datetime import datetime
 from decimal import Decimal
+from pathlib import Path
+from typing import Any
 
+import httpx
 import pytest
-import respx
-from httpx import Response
+from sqlalchemy import Engine, create_engine, text
+from sqlalchemy.orm import Session
 
-from app.core.config import settings
+from app.core.database import init_db, set_engine
 from app.core.exceptions import InvalidAmountError
 from app.models.models import Transaction
 from app.services.conversion_service import ConversionService
@@ -14,41 +17,34 @@ from app.services.rate_service import RateService
 
 
 @pytest.fixture
-def conversion_service() -> ConversionService:
-    """Create a test ConversionService."""
-    return ConversionService(RateService())
+def conversion_service(mock_http_client: httpx.AsyncClient) -> ConversionService:
+    """Create a test ConversionService whose rates come from the mock transport."""
+    return ConversionService(RateService(http_client=mock_http_client))
 
 
-@pytest.mark.asyncio
 async def test_convert_currency_success(
     conversion_service: ConversionService,
     db_session: Generator,
-    mock_rates_response: dict[str, Decimal],
-    test_data: dict
+    test_data: Mapping[str, Any]
 ) -> None:
     """"Test successful currency conversion."""
-    with respx.mock as respx_mock:
-        respx_mock.get(settings.EXCHANGE_RATE_API_URL).mock(
-            return_value=Response(200, json=mock_rates_response)
-        )
-
-        result = await conversion_service.convert_currency(
-            user_id=test_data["user_id"],
-            from_currency=test_data["from_currency"],
-            to_currency=test_data["to_currency"],
-            amount=Decimal(test_data["amount"]),
-            db=db_session
-        )
+    result = await conversion_service.convert_currency(
+        user_id=test_data["user_id"],
+        from_currency=test_data["from_currency"],
+        to_currency=test_data["to_currency"],
+        amount=Decimal(test_data["amount"]),
+        db=db_session
+    )
 
-        assert result["user_id"] == test_data["user_id"]
-        assert result["from"]["currency"] == test_data["from_currency"]
-        assert result["from"]["amount"] == Decimal(test_data["amount"])
-        assert result["to"]["currency"] == test_data["to_currency"]
-        assert isinstance(result["rate"], Decimal)
-        assert isinstance(result["timestamp"], datetime)
+    assert result["user_id"] == test_data["user_id"]
+    assert result["from"]["currency"] == test_data["from_currency"]
+    assert result["from"]["amount"] == Decimal(test_data["amount"])
+    assert result["to"]["currency"] == test_data["to_currency"]
+    assert isinstance(result["rate"], Decimal)
+    assert isinstance(result["timestamp"], datetime)
+    assert result["timestamp"].tzinfo is not None
 
 
-@pytest.mark.asyncio
 async def test_convert_currency_negative_amount(
     conversion_service: ConversionService,
     db_session: Generator
@@ -64,39 +60,31 @@ async def test_convert_currency_negative_amount(
         )
 
 
-@pytest.mark.asyncio
 async def test_convert_currency_saves_transaction(
     conversion_service: ConversionService,
     db_session: Generator,
-    mock_rates_response: dict[str, Decimal],
-    test_data: dict
+    test_data: Mapping[str, Any]
 ) -> None:
     """Test that conversion creates a transaction record."""
-    with respx.mock as respx_mock:
-        respx_mock.get(settings.EXCHANGE_RATE_API_URL).mock(
-            return_value=Response(200, json=mock_rates_response)
-        )
-
-        result = await conversion_service.convert_currency(
-            user_id=test_data["user_id"],
-            from_currency=test_data["from_currency"],
-            to_currency=test_data["to_currency"],
-            amount=Decimal(test_data["amount"]),
-            db=db_session
-        )
+    result = await conversion_service.convert_currency(
+        user_id=test_data["user_id"],
+        from_currency=test_data["from_currency"],
+        to_currency=test_data["to_currency"],
+        amount=Decimal(test_data["amount"]),
+        db=db_session
+    )
 
-        # Verify transaction was saved
-        transaction = (
-            db_session.query(Transaction).filter_by(id=result["transaction_id"]).first()
-        )
-        assert transaction is not None
-        assert transaction.user_id == test_data["user_id"]
-        assert transaction.source_currency == test_data["from_currency"]
-        assert transaction.target_currency == test_data["to_currency"]
-        assert transaction.source_amount == Decimal(test_data["amount"])
+    # Verify transaction was saved
+    transaction = (
+        db_session.query(Transaction).filter_by(id=result["transaction_id"]).first()
+    )
+    assert transaction is not None
+    assert transaction.user_id == test_data["user_id"]
+    assert transaction.source_currency == test_data["from_currency"]
+    assert transaction.target_currency == test_data["to_currency"]
+    assert transaction.source_amount == Decimal(test_data["amount"])
 
 
-@pytest.mark.asyncio
 async def test_convert_currency_same_currency(
     conversion_service: ConversionService,
     db_session: Generator
@@ -112,3 +100,40 @@ async def test_convert_currency_same_currency(
 
     assert result["from"]["amount"] == result["to"]["amount"]
     assert result["rate"] == Decimal("1")
+
+
+async def test_convert_currency_on_table_without_timestamp_default(
+    conversion_service: ConversionService,
+    engine: Engine,
+    tmp_path: Path
+) -> None:
+    """Test conversion still gets a timestamp on a transactions table from the old schema."""
+    old_engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with old_engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE transactions (id INTEGER PRIMARY KEY, user_id VARCHAR, "
+                "source_currency VARCHAR(3), target_currency VARCHAR(3), source_amount NUMERIC(18, 2), "
+                "target_amount NUMERIC(18, 2), exchange_rate NUMERIC(18, 2), timestamp DATETIME)"
+            )
+        )
+
+    set_engine(old_engine)
+    try:
+        init_db()
+        with Session(old_engine) as session:
+            result = await conversion_service.convert_currency(
+                user_id="test_user",
+                from_currency="USD",
+                to_currency="EUR",
+                amount=Decimal("100.00"),
+                db=session
+            )
+            stored = session.execute(text("SELECT timestamp FROM transactions")).scalar()
+    finally:
+        set_engine(engine)
+        old_engine.dispose()
+
+    assert stored is not None
+    assert isinstance(result["timestamp"], datetime)
+    assert result["timestamp"].tzinfo is not None
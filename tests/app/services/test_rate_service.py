@@ -3,37 +3,53 @@
 This module contains unit tests for rate service functionality,
 including service methods, error handling, and edge cases.
 """
-from collections.abc import Generator
+from collections.abc import Callable, Generator, Mapping
 from datetime import UTC, datetime
 from decimal import Decimal
+from typing import Any
 
 import pytest
 import respx
-from httpx import Response
 
 from app.core.config import settings
 from app.core.exceptions import ExternalAPIError, InvalidCurrencyError
 from app.models.models import ExchangeRate
-from app.services.rate_service import RateService
+from app.services.rate_service import RateService, close_http_client, get_http_client
+
+# Expected values, built once rather than inside each assertion
+DECIMAL_ONE = Decimal(1)
+EXPECTED_USD_EUR = 1 / 1.18
+
+# Fixed point in time for stored rates, the service never compares it to the clock
+FIXED_NOW = datetime(2024, 1, 1, tzinfo=UTC)
+
+RATES_URL = str(settings.EXCHANGE_RATE_API_URL)
+
+# Mock the exchange rate API for every test, routes are relative to its URL
+pytestmark = pytest.mark.respx(base_url=RATES_URL, assert_all_called=False)
 
 
 @pytest.fixture
 def rate_service() -> RateService:
-    """Create a test RateService."""
-    return RateService()
+    """Create a test RateService with its own empty cache."""
+    return RateService(cache={})
+
+
+@pytest.fixture(autouse=True)
+def rates_route(respx_mock: respx.MockRouter, mock_rates_response: Mapping[str, Any]) -> respx.Route:
+    """Answer the exchange rate API with the mock response unless a test overrides it."""
+    return respx_mock.get("").respond(200, json=dict(mock_rates_response))
 
 
-@pytest.mark.asyncio
 async def test_get_exchange_rate_same_currency(
     rate_service: RateService,
     db_session: Generator
 ) -> None:
     """Test exchange rate for same currency should be 1."""
     rate = await rate_service.get_exchange_rate("EUR", "EUR", db_session)
-    assert rate == Decimal("1")
+    assert rate == DECIMAL_ONE
 
 
-@pytest.mark.asyncio
 async def test_get_exchange_rate_invalid_currency(
     rate_service: RateService,
     db_session: Generator
@@ -43,82 +59,156 @@ async def test_get_exchange_rate_invalid_currency(
         await rate_service.get_exchange_rate("INVALID", "EUR", db_session)
 
 
-@pytest.mark.asyncio
 async def test_get_exchange_rate_successful(
     rate_service: RateService,
-    db_session: Generator,
-    mock_rates_response: dict[str, Decimal]
+    db_session: Generator
 ) -> None:
     """Test successful exchange rate retrieval."""
-    with respx.mock as respx_mock:
-        respx_mock.get(f"{settings.EXCHANGE_RATE_API_URL}").mock(
-            return_value=Response(200, json=mock_rates_response)
-        ).side_effect = lambda r: Response(200, json=mock_rates_response)
-
-        rate = await rate_service.get_exchange_rate("USD", "EUR", db_session)
-        assert isinstance(rate, Decimal)
-        assert float(rate) == pytest.approx(1 / 1.18, rel=1e-6)
+    rate = await rate_service.get_exchange_rate("USD", "EUR", db_session)
+    assert isinstance(rate, Decimal)
+    assert float(rate) == pytest.approx(EXPECTED_USD_EUR, rel=1e-6)
 
 
-@pytest.mark.asyncio
 async def test_get_exchange_rate_api_error(
     rate_service: RateService,
-    db_session: Generator
+    db_session: Generator,
+    rates_route: respx.Route
 ) -> None:
     """Test handling of API errors."""
-    with respx.mock as respx_mock:
-        respx_mock.get(settings.EXCHANGE_RATE_API_URL).mock(
-            return_value=Response(500,json={"error": "Internal Server Error"})
-        )
+    rates_route.respond(500, json={"error": "Internal Server Error"})
 
-        # First call without cached data should raise exception
-        with pytest.raises(ExternalAPIError):
-            await rate_service.get_exchange_rate("USD", "EUR", db_session)
+    # First call without cached data should raise exception
+    with pytest.raises(ExternalAPIError):
+        await rate_service.get_exchange_rate("USD", "EUR", db_session)
 
 
-@pytest.mark.asyncio
 async def test_get_exchange_rate_from_cache(
     rate_service: RateService,
     db_session: Generator,
-    mock_rates_response: dict[str, Decimal]
+    rates_route: respx.Route
 ) -> None:
     """Test exchange rate retrieval from cache."""
-    with respx.mock as respx_mock:
-        # First call to populate cache
-        respx_mock.get(settings.EXCHANGE_RATE_API_URL).mock(
-            return_value=Response(200, json=mock_rates_response)
-        )
-        rate1 = await rate_service.get_exchange_rate("USD", "EUR", db_session)
+    # First call to populate cache
+    rate1 = await rate_service.get_exchange_rate("USD", "EUR", db_session)
 
-        # Second call should use cache
-        rate2 = await rate_service.get_exchange_rate("USD", "EUR", db_session)
+    # Second call should use cache
+    rate2 = await rate_service.get_exchange_rate("USD", "EUR", db_session)
 
-        assert rate1 == rate2
+    assert rate1 == rate2
+    assert rates_route.call_count == 1
+    assert rate_service._pair_rates[("USD", "EUR")] is rate2  # noqa: SLF001
 
 
-@pytest.mark.asyncio
 async def test_get_exchange_rate_from_db(
     rate_service: RateService,
-    db_session: Generator
+    db_session: Generator,
+    rates_route: respx.Route,
+    seed_rates: Callable[[list[ExchangeRate]], None]
 ) -> None:
     """Test exchange rate retrivel from database."""
     # Add test data to database
-    db_rate = ExchangeRate(
-        base_currency="EUR",
-        rates={"USD": "1.18", "JPY": "129.55", "BRL": "6.35", "EUR": "1.0"},
-        last_updated=datetime.now(UTC),
-    )
-    db_session.add(db_rate)
-    db_session.commit()
-
-    with respx.mock as respx_mock:
-        # Make API call fail to force DB fallback
-        respx_mock.get(settings.EXCHANGE_RATE_API_URL).mock(
-            return_value=Response(500, json={"error": "Internal Server Error"})
+    seed_rates([
+        ExchangeRate(
+            base_currency="EUR",
+            rates={"USD": "1.18", "JPY": "129.55", "BRL": "6.35", "EUR": "1.0"},
+            last_updated=FIXED_NOW,
         )
+    ])
+
+    # Make API call fail to force DB fallback
+    rates_route.respond(500, json={"error": "Internal Server Error"})
+
+    rate = await rate_service.get_exchange_rate("USD", "EUR", db_session)
+    assert isinstance(rate, Decimal)
+    assert float(rate) == pytest.approx(EXPECTED_USD_EUR, rel=1e-6)
+
+
+async def test_http_client_is_shared_until_closed() -> None:
+    """Test the HTTP client is reused across calls and recreated after closing."""
+    client = await get_http_client()
+    assert await get_http_client() is client
+
+    await close_http_client()
+    assert client.is_closed
+    assert await get_http_client() is not client
+    await close_http_client()
+
+
+async def test_get_exchange_rate_serves_expired_cache_on_api_error(
+    rate_service: RateService,
+    db_session: Generator,
+    rates_route: respx.Route
+) -> None:
+    """Test expired cached rates are used when the refresh fails."""
+    rate1 = await rate_service.get_exchange_rate("USD", "EUR", db_session)
+
+    # Expire the cache and make the refresh fail
+    rate_service._expires_at = 0.0  # noqa: SLF001
+    rates_route.respond(500, json={"error": "Internal Server Error"})
+    rate2 = await rate_service.get_exchange_rate("USD", "EUR", db_session)
+
+    assert rate1 == rate2
+    assert rates_route.call_count == 2
+
+
+async def test_clear_cache_forces_refresh(
+    rate_service: RateService,
+    db_session: Generator,
+    rates_route: respx.Route
+) -> None:
+    """Test clearing the cache makes the next lookup fetch fresh rates."""
+    await rate_service.get_exchange_rate("USD", "EUR", db_session)
+    rate_service.clear_cache()
+    await rate_service.get_exchange_rate("USD", "EUR", db_session)
+
+    assert rates_route.call_count == 2
+
+
+def test_save_rates_to_db_keeps_single_row(
+    rate_service: RateService,
+    db_session: Generator
+) -> None:
+    """Test saving rates twice updates the existing row instead of adding one."""
+    rate_service._save_rates_to_db(db_session, {"USD": Decimal("1.18")})  # noqa: SLF001
+    rate_service._save_rates_to_db(db_session, {"USD": Decimal("1.20")})  # noqa: SLF001
+
+    rows = db_session.query(ExchangeRate).filter_by(base_currency="EUR").all()
+    assert len(rows) == 1
+    assert rows[0].rates == {"USD": "1.20"}
+    assert rows[0].last_updated is not None
+
+
+def test_is_valid_currency(rate_service: RateService) -> None:
+    """Test currency validation against the supported currencies."""
+    assert rate_service.is_valid_currency("USD")
+    assert not rate_service.is_valid_currency("INVALID")
+
+
+async def test_get_exchange_rate_uses_pair_table(
+    rate_service: RateService,
+    db_session: Generator
+) -> None:
+    """Test pair rates are precomputed on refresh and match the direct calculation."""
+    rate = await rate_service.get_exchange_rate("USD", "BRL", db_session)
+
+    pair_rates = rate_service._pair_rates  # noqa: SLF001
+    assert pair_rates[("USD", "BRL")] == rate
+    assert float(pair_rates[("EUR", "JPY")]) == pytest.approx(129.55)
+    assert ("GBP", "USD") not in pair_rates
+
+
+async def test_get_exchange_rate_uses_injected_cache(
+    db_session: Generator,
+    rates_route: respx.Route
+) -> None:
+    """Test an injected cache is refreshed in place and serves as a fallback."""
+    cache = {"USD": Decimal("2.00")}
+    rate_service = RateService(cache=cache)
+
+    rates_route.respond(500, json={"error": "Internal Server Error"})
+    rate = await rate_service.get_exchange_rate("EUR", "USD", db_session)
+    assert rate == Decimal("2.00")
 
-        # Clear cache to force DB lookup
-        rate_service.cache = {}
-        rate = await rate_service.get_exchange_rate("USD", "EUR", db_session)
-        assert isinstance(rate, Decimal)
-        assert float(rate) == pytest.approx(1 / 1.18, rel=1e-6)
+    rates_route.respond(200, json={"rates": {"USD": 1.18}})
+    await rate_service.get_exchange_rate("EUR", "USD", db_session)
+    assert cache == {"USD": Decimal("1.18")}
@@ -0,0 +1,132 @@
+"""Tests for the transaction service module.
+
+This module contains unit tests for transaction history retrieval,
+including filtering, pagination and error handling.
+"""
+from collections.abc import Generator
+from datetime import UTC, datetime
+from decimal import Decimal
+
+import httpx
+import pytest
+
+from app.core.exceptions import UserNotFoundError
+from app.models.models import Transaction
+from app.services.conversion_service import ConversionService
+from app.services.rate_service import RateService
+from app.services.transaction_service import TransactionService
+
+
+@pytest.fixture
+def transaction_service() -> TransactionService:
+    """Create a test TransactionService."""
+    return TransactionService()
+
+
+def test_get_user_transactions_unknown_user(
+    transaction_service: TransactionService,
+    db_session: Generator
+) -> None:
+    """Test unknown user raises exception."""
+    with pytest.raises(UserNotFoundError):
+        transaction_service.get_user_transactions(
+            user_id="unknown_user",
+            db=db_session,
+            limit=None,
+            offset=None,
+            from_date=None,
+            to_date=None,
+        )
+
+
+@pytest.fixture
+def transactions(db_session: Generator) -> list[Transaction]:
+    """Add three transactions for the test user, one day apart."""
+    rows = [
+        Transaction(
+            user_id="test_user",
+            source_currency="USD",
+            target_currency="EUR",
+            source_amount=Decimal("100.00"),
+            target_amount=Decimal("85.00"),
+            exchange_rate=Decimal("0.85"),
+            timestamp=datetime(2024, 1, day, tzinfo=UTC),
+        )
+        for day in (1, 2, 3)
+    ]
+    db_session.add_all(rows)
+    db_session.commit()
+    return rows
+
+
+def test_get_user_transactions(
+    transaction_service: TransactionService,
+    db_session: Generator,
+    transactions: list[Transaction]
+) -> None:
+    """Test transactions are formatted and ordered newest first."""
+    result = transaction_service.get_user_transactions(
+        user_id="test_user",
+        db=db_session,
+        limit=None,
+        offset=None,
+        from_date=None,
+        to_date=None,
+    )
+
+    assert result["count"] == 3
+    assert result["total"] == 3
+    first = result["transactions"][0]
+    assert first["transaction_id"] == transactions[2].id
+    assert first["from"] == {"currency": "USD", "amount": Decimal("100.00")}
+    assert first["to"] == {"currency": "EUR", "amount": Decimal("85.00")}
+    assert first["rate"] == Decimal("0.85")
+    assert first["timestamp"] == datetime(2024, 1, 3, tzinfo=UTC)
+
+
+def test_get_user_transactions_paginated(
+    transaction_service: TransactionService,
+    db_session: Generator,
+    transactions: list[Transaction]
+) -> None:
+    """Test pagination limits the page but reports the filtered total."""
+    result = transaction_service.get_user_transactions(
+        user_id="test_user",
+        db=db_session,
+        limit=1,
+        offset=1,
+        from_date=datetime(2024, 1, 2, tzinfo=UTC),
+        to_date=None,
+    )
+
+    assert result["count"] == 1
+    assert result["total"] == 2
+    assert result["transactions"][0]["transaction_id"] == transactions[1].id
+
+
+async def test_get_user_transactions_from_date_includes_converted_timestamp(
+    transaction_service: TransactionService,
+    db_session: Generator,
+    mock_http_client: httpx.AsyncClient
+) -> None:
+    """Test a transaction is found when filtering from its own database-set timestamp."""
+    conversion_service = ConversionService(RateService(http_client=mock_http_client))
+    conversion = await conversion_service.convert_currency(
+        user_id="test_user",
+        from_currency="USD",
+        to_currency="EUR",
+        amount=Decimal("100.00"),
+        db=db_session,
+    )
+
+    result = transaction_service.get_user_transactions(
+        user_id="test_user",
+        db=db_session,
+        limit=None,
+        offset=None,
+        from_date=conversion["timestamp"],
+        to_date=None,
+    )
+
+    assert result["count"] == 1
+    assert result["transactions"][0]["transaction_id"] == conversion["transaction_id"]
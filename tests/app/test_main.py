@@ -5,6 +5,8 @@ This module contains test cases for the root and health check endpoints of the F
 
 from fastapi.testclient import TestClient
 
+from app.main import app, create_app
+
 
 def test_root(client: TestClient) -> None:
     """Test the root endpoint."""
@@ -18,3 +20,10 @@ def test_health_check(client: TestClient) -> None:
     response = client.get("/health")
     assert response.status_code == 200
     assert response.json() == {"status": "healthy"}
+
+
+def test_create_app_returns_new_instance() -> None:
+    """Test the application factory builds an independent app."""
+    application = create_app()
+    assert application is not app
+    assert application.title == app.title
@@ -5,73 +5,140 @@ test files. It includes setup and teardown functions for test database connectio
 and other utilities.
 """
 
-from collections.abc import Generator
-from decimal import Decimal
+import os
+import uuid
+from collections.abc import Callable, Generator, Mapping
+from types import MappingProxyType
+from typing import Any
 
+import httpx
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import Engine, create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import Connection, Engine, create_engine, event
+from sqlalchemy.orm import Session
 from sqlalchemy.pool import StaticPool
 
-from app.core.database import Base, set_engine
+from app.core.database import Base, reset_engine, set_engine
 from app.main import app
-
-
-@pytest.fixture
-def client() -> TestClient:
-    """"Fixture for creating a test client for the FastAPI application."""
+from app.models import ExchangeRate
+
+_TEST_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=MEMORY",
+    "PRAGMA synchronous=OFF",
+    "PRAGMA temp_store=MEMORY",
+)
+
+_MOCK_RATES = {
+    "base": "EUR",
+    "rates": {"USD": 1.18, "JPY": 129.55, "BRL": 6.35, "EUR": 1.0},
+    "success": True,
+    "timestamp": 1620000000,
+}
+
+_TEST_DATA = {
+    "user_id": "test_user",
+    "from_currency": "USD",
+    "to_currency": "EUR",
+    "amount": "100.00",
+    "exchange_rate": "0.85",
+    "base_currency": "EUR",
+    "rates": {"USD": "1.18", "JPY": "129.55", "BRL": "6.35"},
+}
+
+
+@pytest.fixture(scope="session")
+def client(engine: Engine) -> TestClient:
+    """"Fixture for creating a test client for the FastAPI application.
+
+    Shared across the session so the application lifespan runs once.
+    """
     with TestClient(app) as client:
         yield client
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def engine() -> Generator:
-    """Create a new test database engine for each test."""
+    """Create the test database engine and schema once per test session.
+
+    The database is a uniquely named shared-cache in-memory database, so its
+    page cache stays warm for the whole session. The name includes the
+    pytest-xdist worker id, so `pytest -n auto` workers never share one.
+    """
+    worker_id = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
     test_engine = create_engine(
-        "sqlite:///:memory:",
+        f"sqlite:///file:testdb_{worker_id}_{uuid.uuid4().hex}?mode=memory&cache=shared&uri=true",
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
 
+    @event.listens_for(test_engine, "connect")
+    def _configure_connection(dbapi_connection: Any, _connection_record: Any) -> None:  # noqa: ANN401
+        # Durability is pointless for a throwaway in-memory database
+        for pragma in _TEST_SQLITE_PRAGMAS:
+            dbapi_connection.execute(pragma)
+        # Let SQLAlchemy emit BEGIN itself so pysqlite does not break savepoints
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(test_engine, "begin")
+    def _begin(connection: Connection) -> None:
+        connection.exec_driver_sql("BEGIN")
+
     Base.metadata.create_all(bind=test_engine)
     set_engine(test_engine)
     yield test_engine
 
-    Base.metadata.drop_all(bind=test_engine)
-    test_engine.dispose()
+    # The in-memory database goes away with the engine, no need to drop tables
+    reset_engine()
 
 
 @pytest.fixture
 def db_session(engine: Engine) -> Generator:
-    """Create a test database session."""
-    session = sessionmaker(bind=engine)
-    session = session()
+    """Create a test database session rolled back at the end of the test.
+
+    The session joins an outer transaction and turns its own commits into
+    savepoints, so everything a test writes is discarded by a single rollback.
+    """
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
     yield session
-    session.rollback()
     session.close()
+    transaction.rollback()
+    connection.close()
 
 
 @pytest.fixture
-def mock_rates_response() -> dict[str, Decimal]:
-    """Mock response from exchange rates API."""
-    return {
-        "base": "EUR",
-        "rates": {"USD": 1.18, "JPY": 129.55, "BRL": 6.35, "EUR": 1.0},
-        "success": True,
-        "timestamp": 1620000000,
-    }
+def seed_rates(db_session: Session) -> Callable[[list[ExchangeRate]], None]:
+    """Return a helper that inserts exchange rate rows in a single transaction.
+
+    Rows go through bulk_save_objects, skipping the per-object unit of work.
+    """
+    def _seed(rates: list[ExchangeRate]) -> None:
+        db_session.bulk_save_objects(rates)
+        db_session.commit()
+
+    return _seed
+
+
+@pytest.fixture(scope="session")
+def mock_rates_response() -> Mapping[str, Any]:
+    """Mock response from exchange rates API, read-only and shared by all tests."""
+    return MappingProxyType(_MOCK_RATES)
+
+
+@pytest.fixture(scope="session")
+def mock_transport(mock_rates_response: Mapping[str, Any]) -> httpx.MockTransport:
+    """Transport answering every request with the mock exchange rates response."""
+    return httpx.MockTransport(lambda _request: httpx.Response(200, json=dict(mock_rates_response)))
 
 
 @pytest.fixture
-def test_data() -> dict:
-    """Common test data."""
-    return {
-        "user_id": "test_user",
-        "from_currency": "USD",
-        "to_currency": "EUR",
-        "amount": "100.00",
-        "exchange_rate": "0.85",
-        "base_currency": "EUR",
-        "rates": {"USD": "1.18", "JPY": "129.55", "BRL": "6.35"},
-    }
+def mock_http_client(mock_transport: httpx.MockTransport) -> httpx.AsyncClient:
+    """HTTP client served by the mock transport, for tests that need no request assertions."""
+    return httpx.AsyncClient(transport=mock_transport)
+
+
+@pytest.fixture(scope="session")
+def test_data() -> Mapping[str, Any]:
+    """Common test data, read-only and shared by all tests."""
+    return MappingProxyType(_TEST_DATA)